@@ -1,60 +1,87 @@
+from datetime import timedelta
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
 
 from .client import MaxStorageClient
-from .const import CONF_STORAGE_HOST, CONF_STORAGE_PASSWORD, CONF_STORAGE_USER, DOMAIN
+from .const import (
+    CONF_SCAN_INTERVAL,
+    CONF_STORAGE_HOST,
+    CONF_STORAGE_PASSWORD,
+    CONF_STORAGE_USER,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
 from .coordinator import MaxStorageDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[str] = ["sensor", "binary_sensor"]
+PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up MaxStorage Collector from a config entry."""
-    _LOGGER.debug("__init__.py:async_setup_entry(%s)", entry.as_dict())
+def _connection_settings(entry: ConfigEntry) -> tuple[str, str, str]:
+    """Return host, user and password, preferring the options over the data."""
+    return (
+        entry.options.get(CONF_STORAGE_HOST, entry.data[CONF_STORAGE_HOST]),
+        entry.options.get(CONF_STORAGE_USER, entry.data[CONF_STORAGE_USER]),
+        entry.options.get(CONF_STORAGE_PASSWORD, entry.data[CONF_STORAGE_PASSWORD]),
+    )
 
-    client = None
-    coordinator = None
 
-    if hass.data.get(DOMAIN) is None:
-        hass.data[DOMAIN] = {}
+async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Set up MaxStorage Collector from a config entry."""
+    _LOGGER.debug("__init__.py:async_setup_entry(%s)", entry.entry_id)
 
-    if hass.data[DOMAIN].get(entry.entry_id) is None:
-        client = MaxStorageClient(
-            entry.data[CONF_STORAGE_HOST],
-            entry.data[CONF_STORAGE_USER],
-            entry.data[CONF_STORAGE_PASSWORD],
-        )
-        await client.setup()
+    client = MaxStorageClient(hass, *_connection_settings(entry))
+    coordinator = MaxStorageDataUpdateCoordinator(hass, entry, client)
 
-        coordinator = MaxStorageDataUpdateCoordinator(hass, client)
-        hass.data[DOMAIN][entry.entry_id] = {
-            "coordinator": coordinator,
-            "client": client,
-        }
-    else:
-        coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-        client = hass.data[DOMAIN][entry.entry_id]["client"]
+    # Authenticate and fetch initial data, a retry starts with fresh objects
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except (ConfigEntryError, ConfigEntryNotReady):
+        await coordinator.async_shutdown()
+        await client.close()
+        raise
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+        "coordinator": coordinator,
+        "client": client,
+    }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # The MAC address is not needed for the sensors, look it up after startup
+    entry.async_create_background_task(
+        hass, _async_setup_background(hass, entry, client), "maxstorage-mac"
+    )
+
     entry.async_on_unload(entry.add_update_listener(update_listener))
     return True
 
 
+async def _async_setup_background(
+    hass: HomeAssistant, entry: ConfigEntry, client: MaxStorageClient
+) -> None:
+    """Look up the MAC address and add it to the device."""
+    await client.async_setup_background()
+    if client.mac:
+        dr.async_get(hass).async_get_or_create(
+            config_entry_id=entry.entry_id,
+            identifiers={(DOMAIN, client.device_info["Ident"])},
+            connections={(dr.CONNECTION_NETWORK_MAC, client.mac)},
+        )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    _LOGGER.debug("__init__.py:async_unload_entry(%s)", entry.as_dict())
+    _LOGGER.debug("__init__.py:async_unload_entry(%s)", entry.entry_id)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    # Close the aiohttp session
+    # Close the aiohttp session, the shared connector stays open
     client = hass.data[DOMAIN][entry.entry_id]["client"]
     await client.close()
 
@@ -65,6 +92,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
-    _LOGGER.debug("__init__.py:update_listener(%s)", entry.as_dict())
-    hass.data[DOMAIN][entry.entry_id].config(entry)
-    entry.title = entry.options[CONF_NAME]
+    _LOGGER.debug("__init__.py:update_listener(%s)", entry.entry_id)
+    client = hass.data[DOMAIN][entry.entry_id]["client"]
+    settings = (client.base_url, client.username, client.password)
+    if _connection_settings(entry) != settings:
+        # A new host or new credentials need a new client
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    coordinator.update_interval = timedelta(
+        seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+    )
+    entry.async_create_background_task(
+        hass, coordinator.async_request_refresh(), "maxstorage-refresh"
+    )
@@ -1,6 +1,7 @@
 """Platform for MaxStorage Ultimate binary sensor integration."""
 from collections.abc import Callable
 from dataclasses import dataclass
+from functools import partial
 import logging
 from typing import Any
 
@@ -31,33 +32,38 @@ async def async_setup_entry(
 
     coordinator = hass.data[DOMAIN][config.entry_id]["coordinator"]
 
-    sensors: list[BinarySensorEntity] = []
     relais_data = coordinator.data.get("Relais", {})
     names = relais_data.get("name", [])
 
-    for index, name in enumerate(names):
-        if name:  # Only add sensors for relays with a name
-            description = MaxStorageBinarySensorDescription(
-                key="relais_{name}",
-                icon="mdi:power-plug",
-                device_class=BinarySensorDeviceClass.POWER,
-                value_fn=lambda data, idx=index: bool(
-                    data.get("Relais", {}).get("value", [])[idx]
-                ),
-                name=name,
-            )
+    # Only add sensors for relays with a name
+    descriptions = [
+        MaxStorageBinarySensorDescription(
+            key=f"relais_{index}",
+            icon="mdi:power-plug",
+            device_class=BinarySensorDeviceClass.POWER,
+            value_fn=partial(_relais_value, idx=index),
+            name=name,
+        )
+        for index, name in enumerate(names)
+        if name
+    ]
 
-            sensor = MaxStorageBinarySensor(coordinator, description)
-            sensors.append(sensor)
+    async_add_entities(
+        MaxStorageBinarySensor(coordinator, description)
+        for description in descriptions
+    )
 
-    async_add_entities(sensors)
 
+def _relais_value(values: tuple[Any, ...], idx: int) -> bool:
+    """Return the state of the relais at the given index."""
+    return bool(values[idx])
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class MaxStorageBinarySensorDescriptionMixin:
     """Mixin for sensor descriptions."""
 
-    value_fn: Callable[[dict[str, Any]], str | int | float | None]
+    value_fn: Callable[[tuple[Any, ...]], bool]
 
 
 @dataclass(frozen=True)
@@ -66,7 +72,7 @@ class MaxStorageBinarySensorDescription(
 ):
     """Describes MaxStorage sensor entity."""
 
-    attr_fn: Callable[[dict[str, Any]], dict[str, Any]] = lambda _: {}
+    attr_fn: Callable[[dict[str, Any]], dict[str, Any]] | None = None
 
 
 class MaxStorageBinarySensor(
@@ -85,22 +91,30 @@ class MaxStorageBinarySensor(
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = description
-        self._attr_unique_id = (
-            f"{coordinator.api.device_info['Ident']}_{description.name}"
-        )
+        self._attr_unique_id = f"{coordinator.ident}_{description.name}"
         self._attr_device_info = coordinator.device_info
+        self._last_is_on: bool | None = None
+        self._last_available: bool | None = None
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return the state attributes of the sensor."""
-        return self.entity_description.attr_fn(self.coordinator.data)
+        if (attr_fn := self.entity_description.attr_fn) is None:
+            return None
+        return attr_fn(self.coordinator.data)
 
     @property
     def is_on(self):
         """Return true if the binary sensor is on."""
-        return self.entity_description.value_fn(self.coordinator.data)
+        return self.entity_description.value_fn(self.coordinator.relais_values)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        available = self.available
+        is_on = self.is_on if available else None
+        if is_on == self._last_is_on and available == self._last_available:
+            return
+        self._last_is_on = is_on
+        self._last_available = available
         self.async_write_ha_state()
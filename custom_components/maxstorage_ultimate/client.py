@@ -1,48 +1,78 @@
 """Module provides a MaxStorageClient class for interacting with the MaxStorage web service."""
+import asyncio
+import html
 import logging
-import os
 import re
 import socket
-import subprocess
-import time
+from urllib.parse import urlencode
 
 import aiohttp
-from bs4 import BeautifulSoup
+from getmac import get_mac_address as _getmac
+import orjson
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 _LOGGER = logging.getLogger(__name__)
 
+# Matches a device info key in a <b> (Version 3.4.0) or <div> (Version 3.4.3)
+# element and the value that follows as plain text or in a sibling <div>
+_DEVICE_INFO_RE = re.compile(
+    r"<(?:b|div)[^>]*>\s*"
+    r"(Anlagenname|MasterController-Nummer|Firmware-Version|Hardware-Version|Ident)"
+    r"\s*:?\s*</(?:b|div)>\s*(?:<div[^>]*>)?([^<]*)"
+)
+# The live data request never changes, so encode it once
+_DATA_BODY = urlencode({"getFullSwarmLiveDataJSON": 1})
+_DATA_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+# Pages larger than this are parsed in the executor to keep the loop free
+_DEVICE_INFO_EXECUTOR_SIZE = 64 * 1024
+
 
 class MaxStorageClient:
     """Client for interacting with the MaxStorage web service."""
 
-    def __init__(self, base_url, username, password) -> None:
+    def __init__(self, hass: HomeAssistant, base_url, username, password) -> None:
         """Initialize the MaxStorageClient object.
 
         Args:
+            hass (HomeAssistant): The Home Assistant instance.
             base_url (str): The base URL of the web service.
             username (str): The username for authentication.
             password (str): The password for authentication.
         """
-        cookie_jar = aiohttp.CookieJar(unsafe=True)
-        self.session = aiohttp.ClientSession(cookie_jar=cookie_jar)
+        self.hass = hass
+        # Keep the cookies per device but share Home Assistant's connector pool
+        self.session = async_create_clientsession(
+            hass, cookie_jar=aiohttp.CookieJar(unsafe=True)
+        )
         self.base_url = base_url
         self.login_url = f"http://{base_url}/home.php"
         self.data_url = f"http://{base_url}/shared/energycontrolfunctions.php"
         self.username = username
         self.password = password
         self.device_info = {}
+        self.ip_address = None
         self.mac = None
-        self.last_auth_time = None
         self.TOKEN_EXPIRY = 600  # 10 minutes
 
-    async def setup(self):
-        """Set up the client."""
-        ip = self.get_ip_address(self.base_url)
+    async def async_setup_minimum(self):
+        """Set up what is needed for the first data refresh."""
+        # The IP is only needed for the MAC lookup, resolve it during the login
+        ip, _ = await asyncio.gather(
+            self.hass.async_add_executor_job(self.get_ip_address, self.base_url),
+            self.authenticate(),
+        )
         if ip is None:
             raise InvalidHostError(f"Invalid host: {self.base_url}")
-        await self.authenticate()
+        self.ip_address = ip
 
-        self.mac = self.get_mac_address(ip)
+    async def async_setup_background(self):
+        """Set up the parts that are not needed for the first data refresh."""
+        if self.ip_address is not None:
+            self.mac = await self.hass.async_add_executor_job(
+                self.get_mac_address, self.ip_address
+            )
 
     def get_ip_address(self, host) -> str | None:
         """Get the IP address of the host."""
@@ -53,46 +83,15 @@ class MaxStorageClient:
 
     def get_mac_address(self, ip_address):
         """Get the MAC address of the host."""
-
-        ping_cmd = ["ping", "-c", "1", ip_address]
-
-        if os.name == "nt":  # Windows
-            cmd = ["arp", "-a"]
-
-        else:  # Unix-based
-            cmd = ["arp", "-a", ip_address]
-
-        try:
-            output = subprocess.check_output(
-                ping_cmd, text=True
-            )  # Ping the host to ensure it's in the ARP table
-            _LOGGER.debug(output)
-            output = subprocess.check_output(cmd, text=True)
-            _LOGGER.debug(output)
-            # Use regex to find the MAC address
-            result = re.search(r"([0-9a-fA-F]{2}[:-]){5}([0-9a-fA-F]{2})", output)
-            if result:
-                _LOGGER.debug("Found MAC: %s", result.group())
-                return result.group()  # MAC address
-            return None
-        except subprocess.CalledProcessError as ex:
-            _LOGGER.error("Error getting MAC address: %s", ex)
-            return None
-        except FileNotFoundError as ex:
-            _LOGGER.error("Error getting MAC address: %s", ex)
-            return None
-
-    async def ensure_authenticated(self):
-        """Ensure that the session is authenticated."""
-        if not self.is_token_valid():
-            await self.authenticate()
+        mac = _getmac(ip=ip_address)
+        _LOGGER.debug("Found MAC: %s", mac)
+        return mac
 
     async def authenticate(self):
         """Authenticate with the server. The session will handle the cookie."""
         data = {"username": self.username, "password": self.password}
         async with self.session.post(self.login_url, data=data) as response:
             if response.status == 200:
-                self.last_auth_time = time.time()
                 await self._read_device_info(response)
             else:
                 raise AuthenticationFailedError(
@@ -103,35 +102,13 @@ class MaxStorageClient:
         """Read the device info from the response."""
 
         content = await response.text()
-        soup = BeautifulSoup(content, "html.parser")
-
-        # Find all potential keys (bold text could be considered a key)
-        keys = soup.find_all(["b", "div"])
-        current_key = None
-
-        for element in keys:
-            text = element.get_text().strip().replace(":", "")
-
-            # If the current element is a key
-            if text and (
-                text
-                in [
-                    "Anlagenname",
-                    "MasterController-Nummer",
-                    "Firmware-Version",
-                    "Hardware-Version",
-                    "Ident",
-                ]
-            ):
-                current_key = text
-                # Directly following sibling logic for Version 3.4.0
-                if element.next_sibling and not element.next_sibling.name:
-                    self.device_info[current_key] = element.next_sibling.strip()
-                # Following div logic for Version 3.4.3
-                elif element.find_next_sibling():
-                    sibling = element.find_next_sibling()
-                    if sibling and not sibling.find(["b"]):
-                        self.device_info[current_key] = sibling.get_text(strip=True)
+        if len(content) > _DEVICE_INFO_EXECUTOR_SIZE:
+            device_info = await self.hass.async_add_executor_job(
+                _parse_device_info, content
+            )
+        else:
+            device_info = _parse_device_info(content)
+        self.device_info.update(device_info)
 
         if not self.device_info:
             _LOGGER.error("Failed to parse device info from response: %s", content)
@@ -141,27 +118,18 @@ class MaxStorageClient:
         """Return the device info."""
         return self.device_info
 
-    def is_token_valid(self):
-        """Check if the token (session) is still valid."""
-        return (
-            self.last_auth_time is not None
-            and time.time() < self.last_auth_time + self.TOKEN_EXPIRY
-        )
-
     async def get_data(self):
         """Make a POST request to the data endpoint using the session with the 'getFullSwarmLiveDataJSON' parameter."""
-        await self.ensure_authenticated()
         try:
             async with self.session.post(
-                self.data_url, data={"getFullSwarmLiveDataJSON": 1}
+                self.data_url, data=_DATA_BODY, headers=_DATA_HEADERS
             ) as response:
                 if response.status == 200:
+                    raw = await response.read()
                     try:
-                        return await response.json(content_type=None)
-                    except ValueError as e:
-                        raise ValueError(
-                            f"Response not in JSON format: {response.text}"
-                        ) from e
+                        return orjson.loads(raw)
+                    except orjson.JSONDecodeError as e:
+                        raise ValueError(f"Response not in JSON format: {raw!r}") from e
                 else:
                     raise HTTPError(
                         f"Failed to fetch data with status code {response.status}: {response.text}"
@@ -170,10 +138,23 @@ class MaxStorageClient:
             raise InvalidHostError(f"Invalid host: {self.data_url}") from e
 
     async def close(self):
-        """Close the aiohttp session."""
+        """Close the aiohttp session.
+
+        The connector is owned by Home Assistant, so this only drops the
+        session and its cookie jar.
+        """
         await self.session.close()
 
 
+def _parse_device_info(content: str) -> dict[str, str]:
+    """Extract the device info key/value pairs from the HTML content."""
+    device_info = {}
+    for key, value in _DEVICE_INFO_RE.findall(content):
+        if value := html.unescape(value).strip():
+            device_info[key] = value
+    return device_info
+
+
 class DataParserError(Exception):
     """Exception raised when data parsing fails."""
 
@@ -1,26 +1,30 @@
 """Config flow for MaxStorage integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import socket
+import time
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry, ConfigFlow, OptionsFlow
 from homeassistant.const import CONF_NAME
-from homeassistant.core import callback
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
 from .client import AuthenticationFailedError, InvalidHostError, MaxStorageClient
 from .const import (
+    CONF_SCAN_INTERVAL,
     CONF_STORAGE_HOST,
     CONF_STORAGE_NAME,
     CONF_STORAGE_PASSWORD,
     CONF_STORAGE_USER,
     CONF_STORAGE_VPN,
     DEFAULT_PASSWORD,
+    DEFAULT_SCAN_INTERVAL,
     DEFAULT_USER,
     DOMAIN,
     ERROR_AUTH_INVALID,
@@ -31,6 +35,32 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Resolved addresses by normalized host, repeated zeroconf discoveries hit this
+_DNS_CACHE: dict[str, tuple[float, str]] = {}
+_DNS_CACHE_TTL = 30
+
+
+def _normalize_host(host: str) -> str:
+    """Return the host in lower case without a trailing dot."""
+    return host.rstrip(".").lower()
+
+
+async def _async_resolve(hass: HomeAssistant, host: str) -> str | None:
+    """Resolve the IPv4 address of a host in the executor."""
+    key = _normalize_host(host)
+    cached = _DNS_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < _DNS_CACHE_TTL:
+        return cached[1]
+
+    # The system resolver also handles mDNS names like <uuid>.local
+    try:
+        address = await hass.async_add_executor_job(socket.gethostbyname, key)
+    except socket.gaierror:
+        return None
+
+    _DNS_CACHE[key] = (time.monotonic(), address)
+    return address
+
 
 class MaxStorageFlowHandler(ConfigFlow, domain=DOMAIN):
     """Handle a MaxStorage config flow."""
@@ -45,16 +75,38 @@ class MaxStorageFlowHandler(ConfigFlow, domain=DOMAIN):
         self._user: str = ""
         self._password: str = ""
         self._unique_id: str | None = None
+        self._client: MaxStorageClient | None = None
+
+    @callback
+    def async_remove(self) -> None:
+        """Close the client when the flow is finished or aborted."""
+        if self._client is not None:
+            self.hass.async_create_task(self._client.close())
+            self._client = None
 
     async def maxstorage_ultimate_init(self) -> str | None:
         """Initialize MaxStorage Ultimate."""
         _LOGGER.debug("config_flow.py:MaxStorageFlowHandler.maxstorage_ultimate_init")
 
+        # Reuse the client and its connection when retrying the same settings
+        client = self._client
+        settings = (self._host, self._user, self._password)
+        if client is None or (
+            (client.base_url, client.username, client.password) != settings
+        ):
+            if client is not None:
+                await client.close()
+            client = self._client = MaxStorageClient(
+                self.hass, self._host, self._user, self._password
+            )
+
         try:
-            client = MaxStorageClient(self._host, self._user, self._password)
+            await client.authenticate()
             await client.get_data()
-            await self.async_set_unique_id(client.get_device_info()["Ident"])
-            await client.close()
+            # Replace a preliminary host based unique ID with the device ident
+            await self.async_set_unique_id(
+                client.get_device_info()["Ident"], raise_on_progress=False
+            )
         except AuthenticationFailedError:
             return ERROR_AUTH_INVALID
         except InvalidHostError:
@@ -68,19 +120,24 @@ class MaxStorageFlowHandler(ConfigFlow, domain=DOMAIN):
     async def async_check_configured_entry(self) -> ConfigEntry | None:
         """Check if entry is configured."""
         assert self._host
-        try:
-            current_host = await self.hass.async_add_executor_job(
-                socket.gethostbyname, self._host
-            )
+        entries = self._async_current_entries(include_ignore=False)
 
-            for entry in self._async_current_entries(include_ignore=False):
-                entry_host = await self.hass.async_add_executor_job(
-                    socket.gethostbyname, entry.data[CONF_STORAGE_HOST]
-                )
-                if entry_host == current_host:
-                    return entry
-        except socket.gaierror:
-            pass
+        # Rediscoveries usually report the configured host, no DNS needed
+        host = _normalize_host(self._host)
+        for entry in entries:
+            if _normalize_host(entry.data[CONF_STORAGE_HOST]) == host:
+                return entry
+
+        hosts = [self._host, *(entry.data[CONF_STORAGE_HOST] for entry in entries)]
+        current_host, *entry_hosts = await asyncio.gather(
+            *(_async_resolve(self.hass, host) for host in hosts)
+        )
+        if current_host is None:
+            return None
+
+        for entry, entry_host in zip(entries, entry_hosts):
+            if entry_host == current_host:
+                return entry
 
         return None
 
@@ -113,6 +170,10 @@ class MaxStorageFlowHandler(ConfigFlow, domain=DOMAIN):
         self._user = user_input[CONF_STORAGE_USER]
         self._password = user_input[CONF_STORAGE_PASSWORD]
 
+        # Claim the host before connecting so parallel flows for it abort early
+        await self.async_set_unique_id(_normalize_host(self._host))
+        self._abort_if_unique_id_configured()
+
         if not (error := await self.maxstorage_ultimate_init()):
             if await self.async_check_configured_entry():
                 error = "already_configured"
@@ -127,10 +188,8 @@ class MaxStorageFlowHandler(ConfigFlow, domain=DOMAIN):
         _LOGGER.debug("Discovered MaxStorage device: %s", discovery_info)
 
         # Extract relevant information
-        self._host = discovery_info.hostname[
-            : -1 if discovery_info.hostname.endswith(".") else None
-        ]
-        self._name = discovery_info.name.replace("._maxstorage._tcp.local.", "")
+        self._host = discovery_info.hostname.removesuffix(".")
+        self._name = discovery_info.name.removesuffix("._maxstorage._tcp.local.")
         self.context[CONF_STORAGE_HOST] = self._host
 
         if uuid := discovery_info.hostname.split(".")[0]:
@@ -257,6 +316,10 @@ class MaxStorageOptionsFlowHandler(OptionsFlow):
                         self.config_entry.data[CONF_STORAGE_PASSWORD],
                     ),
                 ): str,
+                vol.Required(
+                    CONF_SCAN_INTERVAL,
+                    default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=3600)),
             }
         )
 
@@ -9,6 +9,9 @@ CONF_STORAGE_PORT = 80
 CONF_STORAGE_USER = "maxstorage_user"
 CONF_STORAGE_PASSWORD = "maxstorage_password"
 CONF_STORAGE_VPN = "maxstorage_vpn"
+CONF_SCAN_INTERVAL = "scan_interval"
+
+DEFAULT_SCAN_INTERVAL = 30  # seconds
 
 SENSOR_PREFIX = "MaxStorage"
 
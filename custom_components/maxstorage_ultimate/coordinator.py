@@ -1,13 +1,26 @@
 """Module contains the MaxStorageDataUpdateCoordinator class."""
-from datetime import timedelta
+import asyncio
+from datetime import datetime, timedelta
+from functools import cached_property
 import logging
+from typing import Any
 
-from homeassistant.core import HomeAssistant
+import aiohttp
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
 from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .client import MaxStorageClient
-from .const import DOMAIN
+from .client import (
+    AuthenticationFailedError,
+    DataParserError,
+    HTTPError,
+    InvalidHostError,
+    MaxStorageClient,
+)
+from .const import CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -15,31 +28,90 @@ _LOGGER = logging.getLogger(__name__)
 class MaxStorageDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    def __init__(self, hass: HomeAssistant, client: MaxStorageClient) -> None:
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, client: MaxStorageClient
+    ) -> None:
         """Initialize."""
         self.api = client
+        self.ident: str | None = None
+        self.relais_values: tuple[Any, ...] = ()
+        self._unsub_token_refresh: CALLBACK_TYPE | None = None
         super().__init__(
             hass=hass,
             logger=_LOGGER,
-            name=f"{DOMAIN}-{client.mac}-coordinator",
-            update_interval=timedelta(minutes=0.1),
+            name=f"{DOMAIN}-{client.base_url}-coordinator",
+            update_interval=timedelta(
+                seconds=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+            ),
+        )
+
+    async def _async_setup(self) -> None:
+        """Authenticate with the device before the first refresh."""
+        try:
+            await self.api.async_setup_minimum()
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            AuthenticationFailedError,
+            DataParserError,
+            InvalidHostError,
+        ) as e:
+            raise UpdateFailed(f"Error setting up API client: {e}") from e
+        self.ident = self.api.device_info["Ident"]
+
+        # Renew the session before it expires so polls never wait for a login
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+        self._unsub_token_refresh = async_track_time_interval(
+            self.hass,
+            self._async_refresh_token,
+            timedelta(seconds=self.api.TOKEN_EXPIRY - 60),
         )
 
+    async def _async_refresh_token(self, _now: datetime) -> None:
+        """Authenticate again to keep the session valid."""
+        try:
+            await self.api.authenticate()
+        except Exception as e:  # pylint: disable=broad-except
+            _LOGGER.warning("Error refreshing the session: %s", e)
+
+    async def async_shutdown(self) -> None:
+        """Cancel the session refresh and shut down the coordinator."""
+        await super().async_shutdown()
+        if self._unsub_token_refresh is not None:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+
     async def _async_update_data(self):
         """Fetch data from API."""
         try:
-            return (
-                await self.api.get_data()
-            )  # Replace with your async method to fetch data
-        except Exception as e:
+            try:
+                data = await self.api.get_data()
+            except (HTTPError, ValueError):
+                # The session was dropped, e.g. by a failed renewal or a device
+                # reboot, and the device answered with its login page
+                await self.api.authenticate()
+                data = await self.api.get_data()
+        except (
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            ValueError,
+            AuthenticationFailedError,
+            DataParserError,
+            HTTPError,
+            InvalidHostError,
+        ) as e:
             raise UpdateFailed(f"Error communicating with API: {e}") from e
+        # Flatten the relais states once per update for the binary sensors
+        self.relais_values = tuple(data.get("Relais", {}).get("value", ()))
+        return data
 
-    @property
+    @cached_property
     def device_info(self) -> dr.DeviceInfo:
         """Return the device information."""
         di = dr.DeviceInfo(
-            configuration_url=f"http://{self.api.device_info['Ident']}.local",
-            identifiers={(DOMAIN, self.api.device_info["Ident"])},
+            configuration_url=f"http://{self.ident}.local",
+            identifiers={(DOMAIN, self.ident)},
             manufacturer="SolarMax",
             model="15SMT Island(1)",  # get model from device_overview
             name="MaxStorageUltimate",  # get name from device_overview
@@ -4,6 +4,7 @@ from __future__ import annotations
 from collections.abc import Callable
 from dataclasses import dataclass
 import logging
+from operator import methodcaller
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -14,7 +15,7 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
@@ -31,13 +32,15 @@ async def async_setup_entry(
 
     coordinator = hass.data[DOMAIN][config.entry_id]["coordinator"]
 
+    ident = coordinator.ident
     sensors: list[MaxStorageSensor] = [
-        MaxStorageSensor(coordinator, description) for description in SENSOR_TYPES
+        MaxStorageSensor(coordinator, description, ident + suffix)
+        for description, suffix in zip(SENSOR_TYPES, _UID_SUFFIXES)
     ]
     async_add_entities(sensors)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class MaxStorageSensorDescriptionMixin:
     """Mixin for sensor descriptions."""
 
@@ -50,7 +53,7 @@ class MaxStorageSensorDescription(
 ):
     """Describes MaxStorage sensor entity."""
 
-    attr_fn: Callable[[dict[str, Any]], dict[str, Any]] = lambda _: {}
+    attr_fn: Callable[[dict[str, Any]], dict[str, Any]] | None = None
 
 
 class MaxStorageSensor(
@@ -65,13 +68,12 @@ class MaxStorageSensor(
         self,
         coordinator: MaxStorageDataUpdateCoordinator,
         description: MaxStorageSensorDescription,
+        unique_id: str,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
         self.entity_description = description
-        self._attr_unique_id = (
-            f"{coordinator.api.device_info['Ident']}_{description.translation_key}"
-        )
+        self._attr_unique_id = unique_id
         self._attr_device_info = coordinator.device_info
 
     @property
@@ -80,14 +82,11 @@ class MaxStorageSensor(
         return self.entity_description.value_fn(self.coordinator.data)
 
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
+    def extra_state_attributes(self) -> dict[str, Any] | None:
         """Return the state attributes of the sensor."""
-        return self.entity_description.attr_fn(self.coordinator.data)
-
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        if (attr_fn := self.entity_description.attr_fn) is None:
+            return None
+        return attr_fn(self.coordinator.data)
 
 
 SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
@@ -95,7 +94,7 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="batterySoC",
         translation_key="battery_soc",
         icon="mdi:battery",
-        value_fn=lambda data: data["batterySoC"],
+        value_fn=methodcaller("get", "batterySoC"),
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.BATTERY,
@@ -104,7 +103,7 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="batteryCapacity",
         translation_key="battery_capacity",
         icon="mdi:battery",
-        value_fn=lambda data: data["batteryCapacity"],
+        value_fn=methodcaller("get", "batteryCapacity"),
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.ENERGY_STORAGE,
@@ -113,7 +112,7 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="batteryPower",
         translation_key="battery_power",
         icon="mdi:battery",
-        value_fn=lambda data: data["batteryPower"],
+        value_fn=methodcaller("get", "batteryPower"),
         native_unit_of_measurement=UnitOfPower.WATT,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.POWER,
@@ -122,7 +121,7 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="gridPower",
         translation_key="grid_power",
         icon="mdi:transmission-tower",
-        value_fn=lambda data: data["gridPower"],
+        value_fn=methodcaller("get", "gridPower"),
         native_unit_of_measurement=UnitOfPower.WATT,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.POWER,
@@ -131,7 +130,7 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="usagePower",
         translation_key="usage_power",
         icon="mdi:transmission-tower",
-        value_fn=lambda data: data["usagePower"],
+        value_fn=methodcaller("get", "usagePower"),
         native_unit_of_measurement=UnitOfPower.WATT,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.POWER,
@@ -140,7 +139,7 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="plantPower",
         translation_key="plant_power",
         icon="mdi:solar-power",
-        value_fn=lambda data: data["plantPower"],
+        value_fn=methodcaller("get", "plantPower"),
         native_unit_of_measurement=UnitOfPower.WATT,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.POWER,
@@ -149,9 +148,11 @@ SENSOR_TYPES: tuple[MaxStorageSensorDescription, ...] = (
         key="storage_dc_power",
         translation_key="storageDCPower",
         icon="mdi:solar-power",
-        value_fn=lambda data: data["storageDCPower"],
+        value_fn=methodcaller("get", "storageDCPower"),
         native_unit_of_measurement=UnitOfPower.WATT,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.POWER,
     ),
 )
+
+_UID_SUFFIXES: tuple[str, ...] = tuple(f"_{d.translation_key}" for d in SENSOR_TYPES)